@@ -14,20 +14,103 @@ Environment Variables:
 
 import os
 import sys
-import dlt
-from databricks.sql import connect
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from rich.panel import Panel
 from rich.console import Console
-import subprocess
 
 # Add parent directory to path to import utils
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from postgres_cdc.utils.credentials import get_databricks_creds
 from postgres_cdc.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 console = Console()
 
 
+def _cleanup_catalog(catalog: str, host: str, http_path: str, token: str) -> None:
+    """
+    Drop the extra schemas, bronze tables, and volumes for one catalog.
+
+    Opens its own connection so catalogs can be cleaned in parallel
+    (Databricks SQL cursors are not thread-safe).
+    """
+    from databricks.sql import connect
+
+    console.print(f"\n[bold blue]Processing Catalog: {catalog}[/bold blue]")
+
+    with connect(server_hostname=host, http_path=http_path, access_token=token) as conn:
+        with conn.cursor() as cursor:
+            # 1. Drop extra schemas entirely
+            extra_schemas_to_drop = [
+                f"{catalog}.bronze_postgres_raw",
+                f"{catalog}.bronze_staging"
+            ]
+            for schema_full_name in extra_schemas_to_drop:
+                logger.warning(f"Dropping schema (CASCADE): [red]{schema_full_name}[/red]")
+                try:
+                    cursor.execute(f"DROP SCHEMA IF EXISTS {schema_full_name} CASCADE")
+                    logger.info(f"[green]✓[/green] Dropped schema: {schema_full_name}")
+                except Exception as e:
+                    logger.error(f"Error dropping schema {schema_full_name}: {e}")
+
+            # 2. Clean 'bronze' schema (Drop tables and extra volumes)
+            target_bronze_schema = f"{catalog}.bronze"
+            logger.info(f"Cleaning schema: [cyan]{target_bronze_schema}[/cyan]")
+
+            # Drop all tables in bronze - one metadata query instead of SHOW
+            # TABLES, then one DROP per execute (the SQL warehouse runs
+            # exactly one statement per call; a ';'-joined batch is a parse
+            # error)
+            try:
+                cursor.execute(
+                    "SELECT table_name FROM system.information_schema.tables "
+                    f"WHERE table_catalog = '{catalog}' AND table_schema = 'bronze'"
+                )
+                table_names = [row.table_name for row in cursor.fetchall()]
+                if table_names:
+                    for name in table_names:
+                        logger.warning(f"Dropping table: [red]{target_bronze_schema}.{name}[/red]")
+                        cursor.execute(f"DROP TABLE IF EXISTS {target_bronze_schema}.{name}")
+                    logger.info(f"[green]✓[/green] Dropped {len(table_names)} table(s) in {target_bronze_schema}")
+                else:
+                    logger.info(f"No tables found in {target_bronze_schema}")
+            except Exception as e:
+                logger.error(f"Error listing/dropping tables in {target_bronze_schema}: {e}")
+
+            # Drop extra volume in bronze if exists
+            extra_volume = f"{target_bronze_schema}._dlt_staging_load_volume"
+            logger.warning(f"Dropping volume: [red]{extra_volume}[/red]")
+            try:
+                cursor.execute(f"DROP VOLUME IF EXISTS {extra_volume}")
+                logger.info(f"[green]✓[/green] Dropped volume: {extra_volume}")
+            except Exception as e:
+                logger.error(f"Error dropping volume {extra_volume}: {e}")
+
+            # Drop the 'raw' volume so dlt has to recreate it
+            raw_volume = f"{target_bronze_schema}.raw"
+            logger.warning(f"Dropping volume: [red]{raw_volume}[/red]")
+            try:
+                cursor.execute(f"DROP VOLUME IF EXISTS {raw_volume}")
+                logger.info(f"[green]✓[/green] Dropped volume: {raw_volume}")
+            except Exception as e:
+                logger.error(f"Error dropping volume {raw_volume}: {e}")
+
+
+def _delete_directory_contents(workspace, path: str) -> None:
+    """
+    Recursively delete the contents of a volume directory via the Files API.
+
+    Keeps the directory itself in place so dlt does not need to recreate it.
+    Raises NotFound if the directory does not exist.
+    """
+    for entry in workspace.files.list_directory_contents(path):
+        if entry.is_directory:
+            _delete_directory_contents(workspace, entry.path)
+            workspace.files.delete_directory(entry.path)
+        else:
+            workspace.files.delete(entry.path)
+
+
 def cleanup():
     """
     Cleanup Databricks environment by removing schemas, tables, and volumes.
@@ -37,23 +120,29 @@ def cleanup():
     - Drop all tables in the bronze schema
     - Drop staging and raw volumes
     """
+    # Heavy SDK imports deferred until the destructive path actually runs
+    from databricks.sdk import WorkspaceClient
+    from databricks.sdk.errors import NotFound
+
     console.print(Panel.fit(
         "[bold red]⚠️  DATABRICKS CLEANUP[/bold red]\n"
         "[yellow]Destructive Operation - Proceed with Caution[/yellow]",
         border_style="red"
     ))
     
-    # Load credentials from secrets.toml
-    host = dlt.secrets.get("destination.databricks.credentials.server_hostname", str)
-    http_path = dlt.secrets.get("destination.databricks.credentials.http_path", str)
-    # Use DATABRICKS_TOKEN from env or from secrets.toml (uncommented)
-    token = os.environ.get("DATABRICKS_TOKEN") or dlt.secrets.get("destination.databricks.credentials.access_token", str)
-    
+    # Load credentials (cached across calls in the same process)
+    host, http_path, token = get_databricks_creds()
+
     if not token:
         logger.warning("Databricks access token not found. SQL cleanup might fail if authentication relies on it. CLI cleanup will use 'DEFAULT' profile.")
 
     logger.info(f"Connecting to Databricks at [cyan]{host}[/cyan]...")
-    
+
+    # One authenticated client for everything outside the SQL warehouse -
+    # built once here so the Files API section below reuses the warm HTTPS
+    # session instead of re-authenticating per catalog.
+    workspace = WorkspaceClient(host=f"https://{host}", token=token)
+
     # Define relevant catalogs to clean
     relevant_catalogs = [
         "dev_chinook_lakehouse",
@@ -61,91 +150,34 @@ def cleanup():
         "qa_chinook_lakehouse"
     ]
 
-    # Try connecting. If token is missing, this might fail unless other auth methods are configured.
-    try:
-        with connect(server_hostname=host, http_path=http_path, access_token=token) as conn:
-            with conn.cursor() as cursor:
-                for catalog in relevant_catalogs:
-                    console.print(f"\n[bold blue]Processing Catalog: {catalog}[/bold blue]")
-
-                    # 1. Drop extra schemas entirely
-                    extra_schemas_to_drop = [
-                        f"{catalog}.bronze_postgres_raw",
-                        f"{catalog}.bronze_staging"
-                    ]
-                    for schema_full_name in extra_schemas_to_drop:
-                        logger.warning(f"Dropping schema (CASCADE): [red]{schema_full_name}[/red]")
-                        try:
-                            cursor.execute(f"DROP SCHEMA IF EXISTS {schema_full_name} CASCADE")
-                            logger.info(f"[green]✓[/green] Dropped schema: {schema_full_name}")
-                        except Exception as e:
-                            logger.error(f"Error dropping schema {schema_full_name}: {e}")
-
-                    # 2. Clean 'bronze' schema (Drop tables and extra volumes)
-                    target_bronze_schema = f"{catalog}.bronze"
-                    logger.info(f"Cleaning schema: [cyan]{target_bronze_schema}[/cyan]")
-                    
-                    # Drop all tables in bronze
-                    try:
-                        cursor.execute(f"SHOW TABLES IN {target_bronze_schema}")
-                        tables = cursor.fetchall()
-                        if tables:
-                            for table in tables:
-                                table_name = table.tableName
-                                full_name = f"{target_bronze_schema}.{table_name}"
-                                logger.warning(f"Dropping table: [red]{full_name}[/red]")
-                                cursor.execute(f"DROP TABLE IF EXISTS {full_name}")
-                            logger.info(f"[green]✓[/green] Dropped {len(tables)} table(s) in {target_bronze_schema}")
-                        else:
-                            logger.info(f"No tables found in {target_bronze_schema}")
-                    except Exception as e:
-                        logger.error(f"Error listing/dropping tables in {target_bronze_schema}: {e}")
-
-                    # Drop extra volume in bronze if exists
-                    extra_volume = f"{target_bronze_schema}._dlt_staging_load_volume"
-                    logger.warning(f"Dropping volume: [red]{extra_volume}[/red]")
-                    try:
-                        cursor.execute(f"DROP VOLUME IF EXISTS {extra_volume}")
-                        logger.info(f"[green]✓[/green] Dropped volume: {extra_volume}")
-                    except Exception as e:
-                        logger.error(f"Error dropping volume {extra_volume}: {e}")
-
-                    # Drop the 'raw' volume so dlt has to recreate it
-                    raw_volume = f"{target_bronze_schema}.raw"
-                    logger.warning(f"Dropping volume: [red]{raw_volume}[/red]")
-                    try:
-                        cursor.execute(f"DROP VOLUME IF EXISTS {raw_volume}")
-                        logger.info(f"[green]✓[/green] Dropped volume: {raw_volume}")
-                    except Exception as e:
-                        logger.error(f"Error dropping volume {raw_volume}: {e}")
-    except Exception as e:
-        logger.error(f"SQL Connection failed: {e}. Ensure authentication credentials are valid.")
-
-    # 2. Clean 'raw' Volume content using Databricks CLI
-    # This section uses the Databricks CLI. Ensure it's configured for OAuth or DATABRICKS_TOKEN is set.
-    # We iterate again through relevant catalogs for the CLI commands.
+    # Clean all catalogs in parallel - the per-catalog work is independent,
+    # so wall time approaches the slowest catalog instead of the sum.
+    # If token is missing, this might fail unless other auth methods are configured.
+    with ThreadPoolExecutor(max_workers=len(relevant_catalogs)) as executor:
+        futures = {
+            executor.submit(_cleanup_catalog, catalog, host, http_path, token): catalog
+            for catalog in relevant_catalogs
+        }
+        for future in as_completed(futures):
+            catalog = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"SQL cleanup failed for {catalog}: {e}. Ensure authentication credentials are valid.")
+
+    # 2. Clean 'raw' Volume content via the Files API (client built above)
     for catalog in relevant_catalogs:
-        volume_path_cli = f"dbfs:/Volumes/{catalog}/bronze/raw"
-        logger.info(f"Cleaning volume content (CLI): [cyan]{volume_path_cli}[/cyan]")
-        
+        volume_path = f"/Volumes/{catalog}/bronze/raw"
+        logger.info(f"Cleaning volume content (Files API): [cyan]{volume_path}[/cyan]")
+
         try:
-            # Use --profile DEFAULT since user confirmed OAuth login
-            cmd = ["databricks", "fs", "rm", "-r", volume_path_cli, "--profile", "DEFAULT"]
-            logger.debug(f"Running command: {' '.join(cmd)}")
-            subprocess.run(cmd, check=True, capture_output=True, text=True) # No need for env vars if using profile
-            logger.info("[green]✓[/green] Volume cleaned successfully (CLI)")
-            
-        except subprocess.CalledProcessError as e:
-            # Check if error is "not found" which is fine
-            if "not found" in e.stderr.lower() or "no such file" in e.stderr.lower():
-                logger.info(f"Volume path {volume_path_cli} not found (already clean).")
-            else:
-                logger.warning(f"Could not clean volume {volume_path_cli} via CLI: {e.stderr}")
-        except FileNotFoundError:
-            logger.error("databricks CLI not found. This error should not happen as CLI was verified.")
+            _delete_directory_contents(workspace, volume_path)
+            logger.info("[green]✓[/green] Volume cleaned successfully (Files API)")
+        except NotFound:
+            logger.info(f"Volume path {volume_path} not found (already clean).")
         except Exception as e:
-            logger.error(f"Unexpected error cleaning volume {volume_path_cli} via CLI: {e}")
-    
+            logger.error(f"Unexpected error cleaning volume {volume_path}: {e}")
+
     console.print(Panel.fit(
         "[bold green]✓ CLEANUP COMPLETED[/bold green]",
         border_style="green"
@@ -5,114 +5,198 @@ Inspects table schema and control columns to determine delete strategy (Soft vs
 and visibility of metadata.
 
 Usage:
-    uv run scripts/inspect_table.py
+    uv run scripts/inspect_table.py [--force]
 """
 
+import json
 import os
 import sys
-import dlt
-from databricks.sql import connect
 from rich.panel import Panel
 from rich.console import Console
 from rich.table import Table
 
 # Add parent directory to path to import utils
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from postgres_cdc.utils import schema_cache
+from postgres_cdc.utils.db import databricks_session
 from postgres_cdc.utils.logger import setup_logger
+from postgres_cdc.utils.schema_cache import get_columns
 
 logger = setup_logger(__name__)
 console = Console()
 
-def inspect():
+# Control-column classification, hoisted so the per-column loop does a
+# tuple prefix check plus a set membership probe instead of rebuilding
+# and scanning a list per row
+_CONTROL_PREFIX = ("_dlt",)
+_CONTROL_COLUMNS = frozenset({"lsn", "deleted_ts"})
+
+# Full inspection results, cached per Delta table version: when nothing has
+# committed since the last run, the whole analysis (DESCRIBE + soft-delete
+# count + sample row) is replayed from here without touching the warehouse
+_INSPECT_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "postgres_cdc", "invoice_inspect.json"
+)
+
+
+def _render(columns, soft_deleted_count, sample, clustering=None):
+    """Render the inspection report from plain (JSON-safe) data."""
+    schema_table = Table(title="Table Schema (Columns)", show_header=True)
+    schema_table.add_column("Column Name", style="cyan")
+    schema_table.add_column("Type", style="green")
+    schema_table.add_column("Comment", style="yellow")
+
+    has_deleted_ts = False
+
+    for col in columns:
+        name = col["col_name"]
+        dtype = col["data_type"]
+        comment = col["comment"] if col["comment"] else ""
+
+        if name.startswith(_CONTROL_PREFIX) or name in _CONTROL_COLUMNS:
+            schema_table.add_row(name, dtype, "[bold magenta]Control Column[/bold magenta]")
+        else:
+            schema_table.add_row(name, dtype, comment)
+
+        if name == "deleted_ts":
+            has_deleted_ts = True
+
+    console.print(schema_table)
+
+    # Analysis
+    console.print("\n[bold]Analysis:[/bold]")
+    if has_deleted_ts:
+        console.print("- Found [magenta]deleted_ts[/magenta] column.")
+    else:
+        console.print("- [magenta]deleted_ts[/magenta] column NOT found.")
+
+    if soft_deleted_count is not None:
+        console.print(f"- Rows with deleted_ts IS NOT NULL: [bold]{soft_deleted_count}[/bold]")
+
+        if soft_deleted_count == 0:
+            console.print("  (If records were deleted but this is 0, it implies [bold red]HARD DELETE[/bold red] logic is purging them)")
+
+    # Layout check: the verification queries all filter on invoice_id, so
+    # without clustering on it every check scans the full file set
+    if clustering is not None:
+        if "invoice_id" in clustering:
+            console.print("- Table is clustered on [magenta]invoice_id[/magenta] - point lookups prune files.")
+        else:
+            console.print(
+                "- [yellow]Warning: table not clustered on invoice_id - verification queries "
+                "scan all files. Consider ALTER TABLE ... CLUSTER BY (invoice_id).[/yellow]"
+            )
+
+    if sample:
+        sample_table = Table(title="Sample Control Data", show_header=True)
+        for col in sample["cols"]:
+            sample_table.add_column(col)
+        sample_table.add_row(*sample["vals"])
+        console.print(sample_table)
+
+
+def inspect(force: bool = False):
     console.print(Panel.fit(
         "[bold cyan]TABLE INSPECTION: chinook_lakehouse.bronze.invoice[/bold cyan]",
         border_style="cyan"
     ))
 
-    # Load credentials
-    try:
-        host = dlt.secrets.get("destination.databricks.credentials.server_hostname", str)
-        http_path = dlt.secrets.get("destination.databricks.credentials.http_path", str)
-        token = dlt.secrets.get("destination.databricks.credentials.access_token", str)
-    except Exception as e:
-        logger.error(f"Failed to load secrets: {e}")
-        return
-
     target_table = "chinook_lakehouse.bronze.invoice"
 
-    with connect(server_hostname=host, http_path=http_path, access_token=token) as conn:
+    # Process-wide connection - reused across scripts chained in one run
+    with databricks_session() as conn:
         with conn.cursor() as cursor:
-            
+
+            # Pin the report to the current Delta version (shares the
+            # version helper with the schema cache)
+            try:
+                version = schema_cache._table_version(cursor, target_table)
+            except Exception as e:
+                logger.debug(f"Could not read Delta history for {target_table}: {e}")
+                version = None
+
+            if not force and version is not None:
+                try:
+                    with open(_INSPECT_CACHE) as f:
+                        cached = json.load(f)
+                    if cached.get("table") == target_table and cached.get("version") == version:
+                        logger.info(f"Table unchanged since last inspection (v{version}) - replaying cached report")
+                        _render(cached["columns"], cached["soft_deleted_count"], cached["sample"],
+                                cached.get("clustering"))
+                        return
+                except (OSError, ValueError):
+                    pass
+
             # 1. Get Columns (Describe)
             logger.info("Fetching table schema...")
-            cursor.execute(f"DESCRIBE {target_table}")
-            columns = cursor.fetchall()
-            
-            schema_table = Table(title="Table Schema (Columns)", show_header=True)
-            schema_table.add_column("Column Name", style="cyan")
-            schema_table.add_column("Type", style="green")
-            schema_table.add_column("Comment", style="yellow")
-            
-            dlt_cols = []
-            has_deleted_ts = False
-            
+            # Cached per Delta table version - repeated inspections skip the
+            # DESCRIBE round-trip until the table actually changes
+            columns = get_columns(cursor, target_table)
+
+            dlt_cols: set[str] = set()
             for col in columns:
-                name = col.col_name
-                dtype = col.data_type
-                comment = col.comment if col.comment else ""
-                
-                if name.startswith("_dlt") or name in ["lsn", "deleted_ts"]:
-                    dlt_cols.append(name)
-                    schema_table.add_row(name, dtype, "[bold magenta]Control Column[/bold magenta]")
-                else:
-                    schema_table.add_row(name, dtype, comment)
-                
-                if name == "deleted_ts":
-                    has_deleted_ts = True
-            
-            console.print(schema_table)
-            
-            # 2. Analysis
-            console.print("\n[bold]Analysis:[/bold]")
-            if has_deleted_ts:
-                console.print("- Found [magenta]deleted_ts[/magenta] column.")
-            else:
-                console.print("- [magenta]deleted_ts[/magenta] column NOT found.")
-                
+                if col["col_name"].startswith(_CONTROL_PREFIX) or col["col_name"] in _CONTROL_COLUMNS:
+                    dlt_cols.add(col["col_name"])
+
+            # 2. Physical layout - one DESCRIBE DETAIL metadata read
+            clustering = None
+            try:
+                cursor.execute(f"DESCRIBE DETAIL {target_table}")
+                detail = cursor.fetchone()
+                clustering = list(detail.clusteringColumns or [])
+            except Exception as e:
+                logger.debug(f"Could not read table detail for {target_table}: {e}")
+
             # 3. Check for Soft Deleted rows (if column exists)
-            if has_deleted_ts:
+            soft_deleted_count = None
+            if "deleted_ts" in dlt_cols:
                 cursor.execute(f"SELECT count(*) FROM {target_table} WHERE deleted_ts IS NOT NULL")
                 soft_deleted_count = cursor.fetchone()[0]
-                console.print(f"- Rows with deleted_ts IS NOT NULL: [bold]{soft_deleted_count}[/bold]")
-                
-                if soft_deleted_count == 0:
-                    console.print("  (If records were deleted but this is 0, it implies [bold red]HARD DELETE[/bold red] logic is purging them)")
-            
+
             # 4. Sample Data with Control Columns
-            logger.info("\nFetching sample row with control columns...")
+            logger.info("Fetching sample row with control columns...")
             # Construct query selecting known control columns explicitly if they verify existing
             cols_to_select = ["invoice_id", "_dlt_load_id", "_dlt_id"]
             if "lsn" in dlt_cols:
                 cols_to_select.append("lsn")
             if "deleted_ts" in dlt_cols:
                 cols_to_select.append("deleted_ts")
-            
+
             query = f"SELECT {', '.join(cols_to_select)} FROM {target_table} LIMIT 1"
-            
+
+            sample = None
             try:
                 cursor.execute(query)
                 row = cursor.fetchone()
                 if row:
-                    sample_table = Table(title="Sample Control Data", show_header=True)
-                    for col in cols_to_select:
-                        sample_table.add_column(col)
-                    
-                    # Map row values dynamically
-                    vals = [str(getattr(row, c)) for c in cols_to_select]
-                    sample_table.add_row(*vals)
-                    console.print(sample_table)
+                    # Row order matches cols_to_select (it built the SELECT
+                    # list), so index positionally instead of getattr per cell
+                    sample = {
+                        "cols": cols_to_select,
+                        "vals": [str(value) for value in row],
+                    }
             except Exception as e:
                 logger.error(f"Could not fetch sample: {e}")
 
+            _render(columns, soft_deleted_count, sample, clustering)
+
+            if version is not None:
+                try:
+                    os.makedirs(os.path.dirname(_INSPECT_CACHE), exist_ok=True)
+                    tmp_path = _INSPECT_CACHE + ".tmp"
+                    with open(tmp_path, "w") as f:
+                        json.dump({
+                            "table": target_table,
+                            "version": version,
+                            "columns": columns,
+                            "soft_deleted_count": soft_deleted_count,
+                            "sample": sample,
+                            "clustering": clustering,
+                        }, f)
+                    os.replace(tmp_path, _INSPECT_CACHE)
+                except OSError as e:
+                    logger.debug(f"Could not write inspection cache: {e}")
+
+
 if __name__ == "__main__":
-    inspect()
+    inspect(force="--force" in sys.argv[1:])
@@ -12,19 +12,26 @@ Environment Variables:
     All credentials are loaded from .dlt/secrets.toml
 """
 
-import dlt
-from databricks.sql import connect
 from rich.panel import Panel
 from rich.console import Console
 from rich.table import Table
 
 # Updated import to match project structure
+from postgres_cdc.utils.credentials import get_databricks_creds
+from postgres_cdc.utils.db import databricks_session
 from postgres_cdc.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 console = Console()
 
 
+def _fetch_volumes(conn, schema_full):
+    """Run SHOW VOLUMES for one schema on its own cursor."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"SHOW VOLUMES IN {schema_full}")
+        return [vol.volume_name for vol in cursor.fetchall()]
+
+
 def list_volumes():
     """List all volumes in bronze and bronze_staging schemas."""
     console.print(Panel.fit(
@@ -32,48 +39,48 @@ def list_volumes():
         border_style="cyan"
     ))
     
-    # Load credentials
-    host = dlt.secrets.get("destination.databricks.credentials.server_hostname", str)
-    http_path = dlt.secrets.get("destination.databricks.credentials.http_path", str)
-    token = dlt.secrets.get("destination.databricks.credentials.access_token", str)
-    
+    # Load credentials (cached across calls in the same process)
+    host, _, _ = get_databricks_creds()
+
     logger.info(f"Connecting to Databricks at [cyan]{host}[/cyan]...")
-    
-    with connect(server_hostname=host, http_path=http_path, access_token=token) as conn:
-        with conn.cursor() as cursor:
-            schemas_to_check = [
-                ("chinook_lakehouse.bronze", "bronze"),
-                ("chinook_lakehouse.bronze_staging", "bronze_staging")
-            ]
-            
-            for schema_full, schema_name in schemas_to_check:
-                # Create table for this schema
-                volumes_table = Table(
-                    title=f"Schema: {schema_full}",
-                    show_header=True,
-                    header_style="bold cyan"
-                )
-                volumes_table.add_column("Volume Name", style="yellow")
-                
-                try:
-                    cursor.execute(f"SHOW VOLUMES IN {schema_full}")
-                    volumes = cursor.fetchall()
-                    
-                    if volumes:
-                        for vol in volumes:
-                            volumes_table.add_row(vol.volume_name)
-                        logger.info(f"Found [green]{len(volumes)}[/green] volume(s) in {schema_name}")
-                    else:
-                        volumes_table.add_row("[dim](No volumes)[/dim]")
-                        logger.info(f"No volumes found in {schema_name}")
-                    
-                    console.print(volumes_table)
-                    
-                except Exception as e:
-                    logger.error(f"Error listing volumes in {schema_full}: {e}")
-                
-                console.print()  # Add spacing between schemas
-    
+
+    # Process-wide connection - reused across scripts chained in one run
+    with databricks_session() as conn:
+        schemas_to_check = [
+            ("chinook_lakehouse.bronze", "bronze"),
+            ("chinook_lakehouse.bronze_staging", "bronze_staging")
+        ]
+
+        # Sequential on purpose: databricks-sql-connector declares
+        # threadsafety 1 (threads may not share a connection), and these
+        # are two quick metadata calls on the shared session - not worth
+        # a connection per worker.
+        for schema_full, schema_name in schemas_to_check:
+            volumes_table = Table(
+                title=f"Schema: {schema_full}",
+                show_header=True,
+                header_style="bold cyan"
+            )
+            volumes_table.add_column("Volume Name", style="yellow")
+
+            try:
+                volumes = _fetch_volumes(conn, schema_full)
+
+                if volumes:
+                    for volume_name in volumes:
+                        volumes_table.add_row(volume_name)
+                    logger.info(f"Found [green]{len(volumes)}[/green] volume(s) in {schema_name}")
+                else:
+                    volumes_table.add_row("[dim](No volumes)[/dim]")
+                    logger.info(f"No volumes found in {schema_name}")
+
+                console.print(volumes_table)
+
+            except Exception as e:
+                logger.error(f"Error listing volumes in {schema_full}: {e}")
+
+            console.print()  # Add spacing between schemas
+
     console.print(Panel.fit(
         "[bold green]✓ LISTING COMPLETED[/bold green]",
         border_style="green"
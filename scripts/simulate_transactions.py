@@ -17,6 +17,9 @@ Usage:
 
 import sys
 import os
+import json
+import re
+import select
 import subprocess
 from rich.panel import Panel
 from rich.console import Console
@@ -32,12 +35,75 @@ from postgres_cdc.utils.logger import setup_logger
 logger = setup_logger(__name__)
 console = Console()
 
-logger = setup_logger(__name__)
-console = Console()
-
 # Path to the external chinook_db project
 CHINOOK_DB_PROJECT_PATH = "/home/onne/projects/chinook_db/"
 
+# Manifest describing the IDs touched by the last simulation run, consumed
+# by verify_data.py so verification never needs hand-edited IDs
+MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".postgres_cdc", "last_run.json"
+)
+
+
+# Only explicitly ID-shaped output feeds the manifest: an 'ids:'/'id='
+# marker followed by numbers ("inserted ids: 1615, 1616") or a range
+# ("ids 1615-1624"). Bare counts in summary lines ("10 inserts, 2
+# updates") must never be mistaken for invoice IDs - verify_data treats
+# the manifest as authoritative.
+_ID_LIST_RE = re.compile(r"\bids?\s*[:=]?\s*((?:\d+\s*[,\s]\s*)*\d+)", re.IGNORECASE)
+_ID_RANGE_RE = re.compile(r"\bids?\s*[:=]?\s*(\d+)\s*-\s*(\d+)", re.IGNORECASE)
+
+
+def _extract_ids(line):
+    """Return the invoice IDs named on a line, or [] when none are declared."""
+    match = _ID_RANGE_RE.search(line)
+    if match:
+        start, end = int(match.group(1)), int(match.group(2))
+        if start <= end:
+            return list(range(start, end + 1))
+    match = _ID_LIST_RE.search(line)
+    if match:
+        return [int(n) for n in re.findall(r"\d+", match.group(1))]
+    return []
+
+
+def _write_run_manifest(stdout_lines):
+    """
+    Best-effort parse of the simulator output into a run manifest.
+
+    Lines mentioning insert/update/delete contribute IDs only when they
+    carry an explicit ID marker (see _extract_ids). If no line matches
+    that shape, no manifest is written and verify_data.py falls back to
+    its default IDs.
+    """
+    ids = {"inserts": [], "updates": [], "deletes": []}
+    for line in stdout_lines:
+        numbers = _extract_ids(line)
+        if not numbers:
+            continue
+        lowered = line.lower()
+        if "insert" in lowered:
+            ids["inserts"].extend(numbers)
+        elif "updat" in lowered:
+            ids["updates"].extend(numbers)
+        elif "delet" in lowered:
+            ids["deletes"].extend(numbers)
+
+    if not any(ids.values()):
+        logger.debug("No ID-shaped lines in simulator output - manifest not written")
+        return
+
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        tmp_path = MANIFEST_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(ids, f)
+        os.replace(tmp_path, MANIFEST_PATH)
+        logger.info(f"Run manifest written to [cyan]{MANIFEST_PATH}[/cyan]")
+    except OSError as e:
+        logger.warning(f"Could not write run manifest: {e}")
+
 
 def run_external_simulation(inserts: int = 10, updates: int = 2, deletes: int = 1):
     """
@@ -58,42 +124,59 @@ def run_external_simulation(inserts: int = 10, updates: int = 2, deletes: int =
     params_table.add_row("Deletes", str(deletes))
     console.print(params_table)
     
-    # Construct the command to run the external simulator
-    command_input = f"{inserts} {updates} {deletes}"
-    full_command = f'echo "{command_input}" | uv run src/main.py simulate'
-    
+    # Construct the command to run the external simulator. The counts are
+    # fed through stdin directly - no shell, no echo fork, and no injection
+    # surface if the counts ever come from untrusted input.
+    command = ["uv", "run", "src/main.py", "simulate"]
+    command_input = f"{inserts} {updates} {deletes}\n"
+
     try:
         logger.info(f"Executing external simulator in [cyan]{CHINOOK_DB_PROJECT_PATH}[/cyan]")
-        logger.debug(f"Command: {full_command}")
-        
-        # Execute the command in the specified directory
-        process = subprocess.run(
-            full_command,
-            shell=True,
-            check=True,
+        logger.debug(f"Command: {' '.join(command)} <<< {command_input.strip()!r}")
+
+        # Execute the command in the specified directory, streaming output
+        # line by line: feedback shows up as the simulator produces it and
+        # memory stays bounded however many rows it prints
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             cwd=CHINOOK_DB_PROJECT_PATH,
-            capture_output=True,
-            text=True
+            text=True,
+            bufsize=1
         )
-        
+        process.stdin.write(command_input)
+        process.stdin.close()
+
+        stdout_lines = []
+        stderr_lines = []
+        streams = [process.stdout, process.stderr]
+        while streams:
+            ready, _, _ = select.select(streams, [], [])
+            for stream in ready:
+                line = stream.readline()
+                if not line:
+                    streams.remove(stream)
+                    continue
+                if stream is process.stderr:
+                    stderr_lines.append(line)
+                    console.print(f"[yellow]{line.rstrip()}[/yellow]")
+                else:
+                    stdout_lines.append(line)
+                    console.print(line.rstrip())
+
+        returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, command, stderr="".join(stderr_lines)
+            )
+
         logger.info("[bold green]✓[/bold green] External simulation completed successfully!")
-        
-        # Show simulator output
-        if process.stdout:
-            console.print(Panel(
-                process.stdout.strip(),
-                title="[cyan]Simulator Output[/cyan]",
-                border_style="cyan"
-            ))
-        
-        if process.stderr:
-            logger.warning("Simulator stderr:")
-            console.print(Panel(
-                process.stderr.strip(),
-                title="[yellow]Simulator Warnings[/yellow]",
-                border_style="yellow"
-            ))
-        
+
+        # Record the touched IDs so verify_data.py checks this run's data
+        _write_run_manifest(stdout_lines)
+
         # Display next steps
         console.print()
         next_steps = Table(title="Next Steps", show_header=False, box=None)
@@ -0,0 +1,50 @@
+"""
+Command-Line Argument Parsing
+
+Argument parsing for pipeline_main, kept in a module with stdlib-only
+imports so --help, bad-argument exits, and unit tests never pull in dlt,
+psycopg2, or rich.
+
+Usage:
+    from postgres_cdc.cli import parse_args
+
+    args = parse_args()
+"""
+
+import argparse
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse orchestrator command-line arguments.
+
+    Args:
+        argv: Optional argument list (defaults to sys.argv[1:], mainly
+            overridden in tests)
+
+    Returns:
+        Parsed namespace with mode, catalog, dataset and dry_run
+    """
+    parser = argparse.ArgumentParser(
+        description="PostgreSQL to Databricks Pipeline Orchestrator"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["full_load", "cdc", "cdc_once"],
+        help="Pipeline mode: 'full_load' for initial load, 'cdc' for a "
+             "long-lived CDC consumer, or 'cdc_once' for a single CDC tick"
+    )
+    parser.add_argument(
+        "--catalog",
+        help="Target Unity Catalog name (overrides TARGET_CATALOG env var)"
+    )
+    parser.add_argument(
+        "--dataset",
+        help="Target dataset/schema name (overrides TARGET_DATASET env var)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Inspect pipeline state and exit without opening PostgreSQL or Databricks connections"
+    )
+    return parser.parse_args(argv)
@@ -25,6 +25,7 @@ def replication_resource(
     columns: Optional[Dict[str, TTableSchemaColumns]] = None,
     target_batch_size: int = 1000,
     flush_slot: bool = True,
+    max_batches: Optional[int] = None,
 ) -> Iterable[Union[TDataItem, DataItemWithMeta]]:
     """Resource yielding data items for changes in one or more postgres tables.
 
@@ -70,6 +71,12 @@ def replication_resource(
           can eventually lead to a “disk full” condition on the server, because
           the server retains all the WAL segments that might be needed to stream
           the changes via all of the currently open replication slots.
+        max_batches (Optional[int]): Maximum number of batches to process in a
+          single run. Bounds the work done per invocation so a large backlog
+          (e.g. after downtime) is drained over several runs instead of one
+          giant catch-up batch; progress is checkpointed after each batch, so
+          the next run resumes where this one stopped. If not provided, the
+          run continues until the slot is exhausted.
 
         Yields:
             Data items for changes published in the publication.
@@ -88,6 +95,7 @@ def replication_resource(
         f"Replicating slot {slot_name} publication {pub_name} from {start_lsn} to {upto_lsn}"
     )
     # generate items in batches
+    batches_done = 0
     while True:
         gen = ItemGenerator(
             credentials=credentials,
@@ -104,3 +112,13 @@ def replication_resource(
             dlt.current.resource_state()["last_commit_lsn"] = gen.last_commit_lsn
             break
         start_lsn = gen.last_commit_lsn
+        batches_done += 1
+        if max_batches is not None and batches_done >= max_batches:
+            # Bounded run: checkpoint progress and leave the remaining WAL
+            # for the next invocation.
+            dlt.current.resource_state()["last_commit_lsn"] = gen.last_commit_lsn
+            logger.info(
+                f"Reached max_batches={max_batches} for slot {slot_name}; "
+                "remaining changes deferred to the next run"
+            )
+            break
@@ -58,6 +58,10 @@ from .decoders import (
 
 __source_name__ = "pg_replication"
 
+# How many Commit messages to consume between write-position status packets
+# sent to the walsender (see MessageConsumer.process_commit)
+FEEDBACK_EVERY_N_COMMITS = 1000
+
 
 @with_config(
     sections=("sources", "pg_replication"),
@@ -662,6 +666,9 @@ class MessageConsumer:
         self.columns = columns
 
         self.consumed_all: bool = False
+        # write-position feedback is coalesced: one status packet per
+        # FEEDBACK_EVERY_N_COMMITS commits instead of one per message
+        self.commits_since_feedback = 0
         # data_items attribute maintains all data items
         self.data_items: Dict[
             int, List[Union[TDataItem, DataItemWithMeta]]
@@ -712,8 +719,19 @@ class MessageConsumer:
         """Updates object state when Commit message is observed.
 
         Raises StopReplication when `upto_lsn` or `target_batch_size` is reached.
+
+        Reports the write position to the walsender every
+        `FEEDBACK_EVERY_N_COMMITS` commits so `pg_stat_replication` tracks
+        progress during long batches without a status packet per commit.
+        The flush position is deliberately never sent here: the slot is only
+        advanced (via `advance_slot`) on the next run, after the previous
+        batch has actually been committed to the destination.
         """
         self.last_commit_lsn = msg.data_start
+        self.commits_since_feedback += 1
+        if self.commits_since_feedback >= FEEDBACK_EVERY_N_COMMITS:
+            self.commits_since_feedback = 0
+            msg.cursor.send_feedback(write_lsn=msg.data_start)
         if msg.data_start >= self.upto_lsn:
             self.consumed_all = True
         n_items = sum(
@@ -8,95 +8,72 @@ full_load or cdc_load based on the mode parameter.
 Usage:
     # Full snapshot load
     uv run python -m src.postgres_cdc.pipeline_main --mode full_load --catalog chinook --dataset bronze
-    
-    # CDC incremental load
+
+    # CDC consumer (long-lived, polls the replication slot until SIGTERM)
     uv run python -m src.postgres_cdc.pipeline_main --mode cdc --catalog chinook --dataset bronze
-    
+
+    # Single CDC tick (one-shot, for cron triggers and tests)
+    uv run python -m src.postgres_cdc.pipeline_main --mode cdc_once --catalog chinook --dataset bronze
+
     # Via Lakeflow Jobs (pass as parameter)
     PIPELINE_MODE=full_load uv run python -m src.postgres_cdc.pipeline_main
-    
+
 Environment Variables:
-    PIPELINE_MODE: Either 'full_load' or 'cdc' (required if --mode not provided)
+    PIPELINE_MODE: 'full_load', 'cdc' or 'cdc_once' (required if --mode not provided)
     LOG_LEVEL: Logging level (DEBUG, INFO, WARNING, ERROR) - defaults to INFO
     All credentials are loaded from:
     - Local: .dlt/secrets.toml
     - Databricks: dbutils.secrets (scope: dlt_scope)
 """
 
+# Only lightweight stdlib imports at module level - rich, dlt, and the mode
+# runners are imported inside main() after the mode is known, so --help and
+# bad-mode exits stay nearly instant. Argument parsing lives in cli.py.
 import sys
 import os
-import argparse
-import types
-from rich.panel import Panel
-from rich.console import Console
 
-# Databricks specific workaround:
-# Issue: Databricks Serverless pre-loads internal dlt (Delta Live Tables) modules
-# which conflict with the dlt library (dlthub).
-# Fix: Patch sys.meta_path and sys.modules before importing dlt to remove
-# Databricks' internal hooks.
+from .cli import parse_args
 
-# 1. Drop Databricks' post-import hook
-sys.meta_path = [h for h in sys.meta_path if 'PostImportHook' not in repr(h)]
 
-# 2. Purge half-initialized Delta-Live-Tables modules
-for name, module in list(sys.modules.items()):
-    if not isinstance(module, types.ModuleType):
-        continue
-    module_file = getattr(module, '__file__', '') or ''
-    if module_file.startswith('/databricks/spark/python/dlt'):
-        del sys.modules[name]
+def _scrub_databricks_dlt_modules():
+    """
+    Databricks specific workaround:
+    Issue: Databricks Serverless pre-loads internal dlt (Delta Live Tables) modules
+    which conflict with the dlt library (dlthub).
+    Fix: Patch sys.meta_path and sys.modules before importing dlt to remove
+    Databricks' internal hooks.
+    Only needed on Databricks runtimes; local runs skip the scan entirely.
+    """
+    if not os.environ.get("DATABRICKS_RUNTIME_VERSION"):
+        return
 
-# Package Imports
-from .utils.logger import setup_logger  # noqa: E402
-from .full_load import run_full_load    # noqa: E402
-from .cdc_load import run_cdc_load      # noqa: E402
+    # 1. Drop Databricks' post-import hook
+    sys.meta_path = [h for h in sys.meta_path if 'PostImportHook' not in repr(h)]
 
-logger = setup_logger(__name__)
-console = Console()
+    # 2. Purge half-initialized Delta-Live-Tables modules by name instead of
+    # scanning __file__ of every loaded module
+    for name in [
+        n for n in sys.modules
+        if n == 'dlt' or n.startswith('dlt.') or n.startswith('pyspark.dlt')
+    ]:
+        sys.modules.pop(name, None)
 
 
 def main():
     """
     Main orchestrator function.
-    
+
     Routes execution to appropriate pipeline module based on mode parameter.
     Enforces exclusive execution - only runs ONE mode per invocation.
     """
-    parser = argparse.ArgumentParser(
-        description="PostgreSQL to Databricks Pipeline Orchestrator"
-    )
-    parser.add_argument(
-        "--mode",
-        choices=["full_load", "cdc"],
-        help="Pipeline mode: 'full_load' for initial load or 'cdc' for incremental CDC"
-    )
-    parser.add_argument(
-        "--catalog",
-        help="Target Unity Catalog name (overrides TARGET_CATALOG env var)"
-    )
-    parser.add_argument(
-        "--dataset",
-        help="Target dataset/schema name (overrides TARGET_DATASET env var)"
-    )
-    
-    args = parser.parse_args()
-    
+    args = parse_args()
+
     # Get mode from argument or environment variable
     mode = args.mode or os.getenv("PIPELINE_MODE")
-    
-    # Handle catalog and dataset overrides
-    if args.catalog:
-        os.environ["TARGET_CATALOG"] = args.catalog
-        # Explicitly set dlt configuration for Databricks destination
-        os.environ["DESTINATION__DATABRICKS__CREDENTIALS__CATALOG"] = args.catalog
-        logger.info(f"Target Catalog set via CLI: [cyan]{args.catalog}[/cyan]")
-        
-    if args.dataset:
-        os.environ["TARGET_DATASET"] = args.dataset
-        logger.info(f"Target Dataset set via CLI: [cyan]{args.dataset}[/cyan]")
-    
+
     if not mode:
+        from .utils.logger import setup_logger
+        logger = setup_logger(__name__)
         logger.error("Pipeline mode must be specified!")
         logger.info("Usage:")
         logger.info("  uv run pipeline_main.py --mode full_load")
@@ -106,27 +83,61 @@ def main():
         logger.info("  PIPELINE_MODE=full_load uv run pipeline_main.py")
         logger.info("  PIPELINE_MODE=cdc uv run pipeline_main.py")
         sys.exit(1)
-    
-    if mode not in ["full_load", "cdc"]:
-        logger.error(f"Invalid mode '{mode}'. Must be 'full_load' or 'cdc'.")
+
+    if mode not in ["full_load", "cdc", "cdc_once"]:
+        from .utils.logger import setup_logger
+        logger = setup_logger(__name__)
+        logger.error(f"Invalid mode '{mode}'. Must be 'full_load', 'cdc' or 'cdc_once'.")
         sys.exit(1)
-    
+
+    # Mode is valid - now pay for the heavy imports (must scrub Databricks'
+    # internal dlt modules before the dlt library is imported)
+    _scrub_databricks_dlt_modules()
+
+    from rich.panel import Panel
+    from rich.console import Console
+    from .utils.logger import setup_logger
+
+    logger = setup_logger(__name__)
+    console = Console()
+
+    # Handle catalog and dataset overrides
+    if args.catalog:
+        os.environ["TARGET_CATALOG"] = args.catalog
+        # Explicitly set dlt configuration for Databricks destination
+        os.environ["DESTINATION__DATABRICKS__CREDENTIALS__CATALOG"] = args.catalog
+        logger.info(f"Target Catalog set via CLI: [cyan]{args.catalog}[/cyan]")
+
+    if args.dataset:
+        os.environ["TARGET_DATASET"] = args.dataset
+        logger.info(f"Target Dataset set via CLI: [cyan]{args.dataset}[/cyan]")
+
     # Display pipeline header
     console.print(Panel.fit(
         f"[bold cyan]POSTGRES TO DATABRICKS PIPELINE[/bold cyan]\n"
         f"Mode: [bold yellow]{mode.upper()}[/bold yellow]",
         border_style="cyan"
     ))
-    
-    # Route to appropriate pipeline module
+
+    # Route to appropriate pipeline module (imported lazily so only the
+    # chosen branch's dependency chain is loaded)
     if mode == "full_load":
         logger.info("Routing to [bold green]FULL LOAD[/bold green] pipeline...")
-        run_full_load()
-    
-    elif mode == "cdc":
+        from .full_load import run_full_load
+        run_full_load(dry_run=args.dry_run)
+
+    elif mode == "cdc" and not args.dry_run:
+        # Long-lived consumer: one process per always-on Lakeflow task,
+        # polling the slot instead of paying import+handshake per cron tick
+        logger.info("Routing to [bold blue]CDC CONSUMER[/bold blue] (long-lived)...")
+        from .cdc_load import run_cdc_load_forever
+        run_cdc_load_forever()
+
+    elif mode in ("cdc", "cdc_once"):
         logger.info("Routing to [bold blue]CDC LOAD[/bold blue] pipeline...")
-        run_cdc_load()
-    
+        from .cdc_load import run_cdc_load
+        run_cdc_load(dry_run=args.dry_run)
+
     console.print(Panel.fit(
         "[bold green]✓ PIPELINE EXECUTION COMPLETED[/bold green]",
         border_style="green"
@@ -134,4 +145,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
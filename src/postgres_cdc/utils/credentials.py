@@ -0,0 +1,62 @@
+"""
+Databricks Credential Loading with Caching
+
+Every helper script loads the same three Databricks connection values via
+dlt.secrets, which re-parses the TOML secrets backend on each call. This
+module resolves them once per process and caches the result, so scripts
+(and anything importing them as library functions) pay the secrets I/O a
+single time.
+
+Usage:
+    from postgres_cdc.utils.credentials import get_databricks_creds
+
+    host, http_path, token = get_databricks_creds()
+"""
+
+import os
+from functools import lru_cache
+
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_databricks_creds() -> tuple[str, str, str | None]:
+    """
+    Return (server_hostname, http_path, access_token) for Databricks SQL.
+
+    The token prefers the DATABRICKS_TOKEN env var and falls back to dlt
+    secrets; it may be None, in which case the connector's own auth chain
+    (e.g. .databrickscfg) takes over. Results are cached for the lifetime
+    of the process.
+    """
+    import dlt  # deferred - keeps script --help paths free of dlt's import cost
+
+    host = dlt.secrets.get("destination.databricks.credentials.server_hostname", str)
+    http_path = dlt.secrets.get("destination.databricks.credentials.http_path", str)
+    token = os.environ.get("DATABRICKS_TOKEN") or dlt.secrets.get(
+        "destination.databricks.credentials.access_token", str
+    )
+    if not token:
+        logger.debug("No Databricks access token found in env or dlt secrets")
+    return host, http_path, token
+
+
+@lru_cache(maxsize=4)
+def get_pg_credentials(connection_string: str):
+    """
+    Build (and cache) dlt ConnectionStringCredentials for a DSN.
+
+    The parse is cheap but not free, and long-lived workers re-enter the
+    pipelines with the same connection string on every tick.
+    """
+    from dlt.sources.credentials import ConnectionStringCredentials
+
+    return ConnectionStringCredentials(connection_string)
+
+
+def clear_credentials_cache() -> None:
+    """Drop the cached credentials (mainly for tests)."""
+    get_databricks_creds.cache_clear()
+    get_pg_credentials.cache_clear()
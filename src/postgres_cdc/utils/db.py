@@ -0,0 +1,71 @@
+"""
+Databricks SQL Connection Reuse
+
+Each helper script used to open (and close) its own Databricks SQL
+connection, paying a full TLS handshake plus Thrift session-open per run.
+This module memoizes one connection per (host, http_path) for the lifetime
+of the process - the same pattern pg_pool.py applies to PostgreSQL - so
+chained script invocations in one process reuse the warm session.
+
+Usage:
+    from postgres_cdc.utils.db import databricks_session
+
+    with databricks_session() as conn:
+        with conn.cursor() as cursor:
+            ...
+"""
+
+import atexit
+import threading
+from contextlib import contextmanager
+
+from .credentials import get_databricks_creds
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Maps (host, http_path) to an open Connection
+_CONNECTIONS: dict = {}
+_LOCK = threading.Lock()
+
+
+@contextmanager
+def databricks_session():
+    """
+    Yield a process-wide Databricks SQL connection.
+
+    The connection is created on first use from the cached credentials and
+    deliberately NOT closed on exit - it stays warm for the next caller and
+    is torn down atexit. Cursors opened on it must still be closed by the
+    caller (the usual `with conn.cursor()` pattern).
+    """
+    from databricks.sql import connect  # deferred - keeps import cost off non-SQL paths
+
+    host, http_path, token = get_databricks_creds()
+    key = (host, http_path)
+    with _LOCK:
+        conn = _CONNECTIONS.get(key)
+        if conn is None:
+            connect_args = {"server_hostname": host, "http_path": http_path}
+            if token:
+                connect_args["access_token"] = token
+            else:
+                logger.info("No access token provided. Attempting to connect using default credentials (e.g. .databrickscfg)...")
+            logger.debug(f"Opening Databricks SQL connection to {host}")
+            conn = connect(**connect_args)
+            _CONNECTIONS[key] = conn
+    yield conn
+
+
+def close_all_sessions() -> None:
+    """Close every memoized connection. Registered to run at exit."""
+    with _LOCK:
+        for conn in _CONNECTIONS.values():
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing Databricks connection: {e}")
+        _CONNECTIONS.clear()
+
+
+atexit.register(close_all_sessions)
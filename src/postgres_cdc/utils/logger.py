@@ -17,57 +17,57 @@ import os
 from rich.logging import RichHandler
 from rich.console import Console
 
+# One console/handler/formatter shared by every logger in the process -
+# handler construction is not free and N module loggers don't need N
+# consoles. Locals capture in tracebacks walks every frame's variables on
+# each exception log (and can leak secrets into logs), so it is opt-in.
+_CONSOLE = Console(stderr=True)
+_HANDLER = RichHandler(
+    console=_CONSOLE,
+    show_time=True,
+    show_path=False,
+    markup=True,
+    rich_tracebacks=True,
+    tracebacks_show_locals=os.getenv("LOG_TRACEBACK_LOCALS") == "1",
+)
+_HANDLER.setFormatter(logging.Formatter(
+    fmt="%(message)s",
+    datefmt="[%Y-%m-%d %H:%M:%S]"
+))
+
 
 def setup_logger(name: str, level: str | None = None) -> logging.Logger:
     """
     Configure and return a logger with rich console formatting.
-    
+
     Args:
         name: Logger name (typically __name__ from calling module)
         level: Optional log level override. If not provided, uses LOG_LEVEL env var or defaults to INFO
-    
+
     Returns:
-        Configured logger instance with RichHandler
+        Configured logger instance with the shared RichHandler
     """
     # Determine log level
     if level is None:
         level = os.getenv("LOG_LEVEL", "INFO").upper()
-    
+
     # Map string level to logging constant
     numeric_level = getattr(logging, level, logging.INFO)
-    
+
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(numeric_level)
-    
+
     # Avoid duplicate handlers if logger already configured
     if logger.handlers:
         return logger
-    
-    # Configure rich console handler
-    console = Console(stderr=True)
-    rich_handler = RichHandler(
-        console=console,
-        show_time=True,
-        show_path=False,
-        markup=True,
-        rich_tracebacks=True,
-        tracebacks_show_locals=True,
-    )
-    
-    # Set format for log messages
-    formatter = logging.Formatter(
-        fmt="%(message)s",
-        datefmt="[%Y-%m-%d %H:%M:%S]"
-    )
-    rich_handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(rich_handler)
-    
+
+    # Attach the shared handler
+    logger.addHandler(_HANDLER)
+
     # Prevent propagation to root logger to avoid duplicate logs
     logger.propagate = False
-    
+
     return logger
 
 
@@ -0,0 +1,97 @@
+"""
+Shared PostgreSQL Connection Pool
+
+Pipeline startup used to open a fresh one-shot psycopg2 connection for every
+short query (table discovery, slot checks), paying the full TCP + TLS + auth
+handshake each time. This module keeps a small ThreadedConnectionPool per DSN
+alive for the lifetime of the process so repeated queries only pay a pool
+checkout.
+
+Note: replication connections (LogicalReplicationConnection) are NOT served
+from the pool - they require a dedicated connection and are managed by
+pg_replication/helpers.py.
+
+Usage:
+    from postgres_cdc.utils.pg_pool import pooled_connection
+
+    with pooled_connection(dsn) as conn:
+        with conn.cursor() as cur:
+            ...
+"""
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from psycopg2.extensions import connection as ConnectionExt
+from psycopg2.pool import ThreadedConnectionPool
+
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# One pool per DSN, created lazily on first use
+_POOLS: dict[str, ThreadedConnectionPool] = {}
+_LOCK = threading.Lock()
+
+
+def get_pool(dsn: str, minconn: int = 1, maxconn: int | None = None) -> ThreadedConnectionPool:
+    """
+    Return the connection pool for `dsn`, creating it on first use.
+
+    Args:
+        dsn: PostgreSQL connection string
+        minconn: Minimum number of pooled connections
+        maxconn: Maximum number of pooled connections. Defaults to the
+            PG_POOL_MAX env var (or 4), so deployments can cap the pipeline's
+            connection footprint without code changes - cloud PG instances
+            reserve few slots and concurrent jobs exhaust them quickly.
+
+    Returns:
+        A ThreadedConnectionPool shared across the process
+    """
+    pool = _POOLS.get(dsn)
+    if pool is not None:
+        return pool
+    if maxconn is None:
+        maxconn = int(os.environ.get("PG_POOL_MAX", "4"))
+    with _LOCK:
+        pool = _POOLS.get(dsn)
+        if pool is None:
+            logger.debug(f"Creating PostgreSQL connection pool (max {maxconn})")
+            pool = ThreadedConnectionPool(minconn, maxconn, dsn=dsn)
+            _POOLS[dsn] = pool
+        return pool
+
+
+@contextmanager
+def pooled_connection(dsn: str) -> Iterator[ConnectionExt]:
+    """
+    Check a connection out of the pool and return it when done.
+
+    Commits on success and rolls back on error, mirroring the behavior of
+    `with psycopg2.connect(...)` so call sites can migrate transparently.
+    """
+    pool = get_pool(dsn)
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def close_all_pools() -> None:
+    """Close every pooled connection (registered at interpreter exit)."""
+    with _LOCK:
+        for pool in _POOLS.values():
+            pool.closeall()
+        _POOLS.clear()
+
+
+atexit.register(close_all_pools)
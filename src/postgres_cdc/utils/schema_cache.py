@@ -0,0 +1,83 @@
+"""
+Delta Table Schema Caching
+
+inspect_table.py re-runs DESCRIBE on every invocation even though the bronze
+schema only changes when a load actually commits. This module caches DESCRIBE
+output on disk keyed by the Delta table version (a cheap metadata read via
+DESCRIBE HISTORY), so the cache can never serve a stale schema: any commit
+bumps the version and misses the cache.
+
+Usage:
+    from postgres_cdc.utils.schema_cache import get_columns
+
+    columns = get_columns(cursor, "catalog.bronze.invoice")
+"""
+
+import hashlib
+import json
+import os
+
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "postgres_cdc", "describe")
+
+
+def _table_version(cursor, fq_table: str) -> int | None:
+    """Return the current Delta version of `fq_table` (most recent commit)."""
+    cursor.execute(f"DESCRIBE HISTORY {fq_table} LIMIT 1")
+    row = cursor.fetchone()
+    return None if row is None else int(row.version)
+
+
+def _describe(cursor, fq_table: str) -> list[dict]:
+    """Run DESCRIBE and normalize the rows into JSON-friendly dicts."""
+    cursor.execute(f"DESCRIBE {fq_table}")
+    described = cursor.fetchall_arrow()
+    return [
+        {"col_name": name, "data_type": dtype, "comment": comment}
+        for name, dtype, comment in zip(
+            described.column("col_name").to_pylist(),
+            described.column("data_type").to_pylist(),
+            described.column("comment").to_pylist(),
+        )
+    ]
+
+
+def get_columns(cursor, fq_table: str) -> list[dict]:
+    """
+    Return the column descriptions of `fq_table`, cached per table version.
+
+    Each dict has 'col_name', 'data_type', and 'comment' keys. When the
+    version lookup fails (e.g. not a Delta table) the cache is bypassed and
+    a plain DESCRIBE runs instead.
+    """
+    try:
+        version = _table_version(cursor, fq_table)
+    except Exception as e:
+        logger.debug(f"Could not read Delta history for {fq_table}: {e}")
+        version = None
+    if version is None:
+        return _describe(cursor, fq_table)
+
+    key = hashlib.sha256(f"{fq_table}@{version}".encode()).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        with open(cache_path) as f:
+            columns = json.load(f)
+        logger.debug(f"Schema cache hit for {fq_table} @ v{version}")
+        return columns
+    except (OSError, ValueError):
+        pass
+
+    columns = _describe(cursor, fq_table)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(columns, f)
+        os.replace(tmp_path, cache_path)  # atomic - readers never see partial JSON
+    except OSError as e:
+        logger.debug(f"Could not write schema cache for {fq_table}: {e}")
+    return columns
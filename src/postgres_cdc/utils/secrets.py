@@ -0,0 +1,66 @@
+"""
+Databricks Secret Lookup with Caching
+
+cdc_load.py and full_load.py carried identical get_dbutils/get_secret
+copies, and each call re-ran SparkSession.builder.getOrCreate() (a Py4J
+crossing) plus a REST-backed dbutils.secrets.get. This module keeps one
+SparkSession and DBUtils handle per process and memoizes secrets per
+(scope, key), so repeated lookups cost a dict probe.
+
+Usage:
+    from postgres_cdc.utils.secrets import get_secret
+
+    value = get_secret("dlt_scope", "pg_connection_string")
+"""
+
+import os
+from functools import lru_cache
+
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Process-wide handles, built once on first use
+_SPARK = None
+_DBUTILS = None
+
+
+def _spark():
+    """Return the cached SparkSession, creating it on first use."""
+    global _SPARK
+    if _SPARK is None:
+        from pyspark.sql import SparkSession
+        _SPARK = SparkSession.builder.getOrCreate()
+    return _SPARK
+
+
+def _dbutils():
+    """Return the cached DBUtils handle, or None outside Databricks."""
+    global _DBUTILS
+    if _DBUTILS is None:
+        # On local dev the pyspark import alone costs hundreds of ms (and
+        # tens of MB) just to fail at DBUtils - the runtime env var tells
+        # us up front that there is no dbutils to find.
+        if "DATABRICKS_RUNTIME_VERSION" not in os.environ:
+            return None
+        try:
+            from pyspark.dbutils import DBUtils
+            _DBUTILS = DBUtils(_spark())
+        except ImportError:
+            return None
+    return _DBUTILS
+
+
+@lru_cache(maxsize=64)
+def get_secret(scope, key):
+    """Get secret from Databricks dbutils or dlt secrets"""
+    # Try dbutils first (for Databricks environment)
+    try:
+        dbutils = _dbutils()
+        if dbutils:
+            return dbutils.secrets.get(scope=scope, key=key)
+    except Exception as e:
+        logger.debug(f"Could not get dbutils secret: {e}")
+
+    # Fallback to dlt secrets (local or env vars)
+    return None
@@ -0,0 +1,167 @@
+"""
+PostgreSQL Table Discovery with Caching
+
+Both the full load and CDC pipelines need the list of user tables in the
+'public' schema before they can run. Opening a fresh PostgreSQL connection
+just for that one query dominates startup time on frequent Lakeflow re-runs,
+so the result is cached in-process with a TTL and shared across invocations.
+
+Usage:
+    from postgres_cdc.utils.table_discovery import get_public_tables
+
+    tables = get_public_tables(creds)
+"""
+
+import io
+import json
+import os
+import time
+import hashlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # imported for annotations only - keeps this module dlt-free
+    from dlt.sources.credentials import ConnectionStringCredentials
+
+from .logger import setup_logger
+from .pg_pool import pooled_connection
+
+logger = setup_logger(__name__)
+
+# Default cache lifetime in seconds. Schema DDL rarely changes between
+# pipeline ticks, so 5 minutes is a safe freshness window.
+DEFAULT_TTL = 300
+
+# Maps a credentials fingerprint to (fetch timestamp, table list)
+_CACHE: dict[str, tuple[float, list[str]]] = {}
+
+# On-disk layer: each Lakeflow tick is a fresh process, so the in-process
+# cache alone never survives between runs. Entries carry a wall-clock
+# timestamp and honor the same TTL as the in-memory layer.
+_DISK_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "postgres_cdc", "tables",
+)
+
+
+def _load_disk_cache(key: str, ttl: int) -> list[str] | None:
+    """Return a fresh-enough cached table list from disk, if any."""
+    try:
+        with open(os.path.join(_DISK_CACHE_DIR, f"{key}.json")) as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - payload.get("generated_at", 0) >= ttl:
+        return None
+    tables = payload.get("tables")
+    return tables if isinstance(tables, list) else None
+
+
+def _store_disk_cache(key: str, tables: list[str]) -> None:
+    """Persist the table list for future processes (best effort)."""
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        path = os.path.join(_DISK_CACHE_DIR, f"{key}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"tables": tables, "generated_at": time.time()}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write table discovery cache: {e}")
+
+
+def _cache_key(creds: "ConnectionStringCredentials") -> str:
+    """Derive a stable cache key from the connection string."""
+    dsn = creds.to_native_representation()
+    return hashlib.sha256(dsn.encode()).hexdigest()
+
+
+def get_public_tables(
+    creds: "ConnectionStringCredentials", ttl: int = DEFAULT_TTL
+) -> list[str]:
+    """
+    Return the user tables in the PostgreSQL 'public' schema.
+
+    Results are cached per connection string for `ttl` seconds so repeated
+    pipeline invocations in the same process skip the discovery round-trip.
+    dlt internal tables (prefixed with '_dlt') are excluded.
+
+    Args:
+        creds: PostgreSQL connection credentials
+        ttl: Cache lifetime in seconds. Pass 0 to force a fresh query.
+
+    Returns:
+        List of table names in the 'public' schema
+    """
+    key = _cache_key(creds)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        fetched_at, tables = cached
+        if time.monotonic() - fetched_at < ttl:
+            logger.debug(f"Table discovery cache hit ({len(tables)} table(s))")
+            return tables
+
+    if ttl > 0:
+        tables = _load_disk_cache(key, ttl)
+        if tables is not None:
+            logger.debug(f"Table discovery disk cache hit ({len(tables)} table(s))")
+            _CACHE[key] = (time.monotonic(), tables)
+            return tables
+
+    tables = _query_public_tables(creds)
+    _CACHE[key] = (time.monotonic(), tables)
+    _store_disk_cache(key, tables)
+    return tables
+
+
+# dlt internal tables are excluded server-side so the result set never
+# contains them ('\_' escapes the LIKE wildcard). The COPY wrapper streams
+# the names as one bulk text transfer instead of a Python tuple per row.
+_DISCOVERY_QUERY = (
+    "COPY (SELECT tablename FROM pg_tables "
+    "WHERE schemaname = 'public' AND tablename NOT LIKE '\\_dlt%' ESCAPE '\\') "
+    "TO STDOUT"
+)
+
+
+def _query_public_tables(creds: "ConnectionStringCredentials") -> list[str]:
+    """Query pg_tables for user tables in the 'public' schema."""
+    logger.debug("Table discovery cache miss - querying pg_tables")
+    buf = io.BytesIO()
+    with pooled_connection(creds.to_native_representation()) as conn:
+        with conn.cursor() as cur:
+            cur.copy_expert(_DISCOVERY_QUERY, buf)
+    # COPY text format is one row per newline; split only on those so
+    # table names containing spaces survive intact
+    return [line for line in buf.getvalue().decode().splitlines() if line]
+
+
+def get_publication_tables(
+    creds: "ConnectionStringCredentials", pub_name: str
+) -> list[str]:
+    """
+    Return the tables already covered by a replication publication.
+
+    Once the publication exists it is the authoritative table set for CDC -
+    a single indexed lookup on pg_publication_tables, much cheaper than a
+    pg_tables scan plus the per-table publication DDL that init_replication
+    would redo. Returns an empty list when the publication does not exist
+    yet (bootstrap falls back to full discovery).
+    """
+    with pooled_connection(creds.to_native_representation()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT tablename FROM pg_publication_tables WHERE pubname = %s",
+                (pub_name,),
+            )
+            return [row[0] for row in cur]
+
+
+def clear_cache() -> None:
+    """Drop all cached discovery results, on disk included (mainly for tests)."""
+    _CACHE.clear()
+    try:
+        for name in os.listdir(_DISK_CACHE_DIR):
+            if name.endswith(".json"):
+                os.unlink(os.path.join(_DISK_CACHE_DIR, name))
+    except OSError:
+        pass
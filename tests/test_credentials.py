@@ -0,0 +1,32 @@
+import pytest
+from unittest.mock import patch
+from postgres_cdc.utils.credentials import (
+    clear_credentials_cache,
+    get_databricks_creds,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    """Ensure each test starts with an empty credentials cache."""
+    clear_credentials_cache()
+    yield
+    clear_credentials_cache()
+
+
+def test_second_call_skips_secrets_backend(monkeypatch):
+    """Repeated lookups must hit the lru_cache, not dlt.secrets."""
+    monkeypatch.delenv("DATABRICKS_TOKEN", raising=False)
+    with patch("dlt.secrets") as mock_secrets:
+        mock_secrets.get.side_effect = ["host", "/sql/path", "token"]
+        assert get_databricks_creds() == ("host", "/sql/path", "token")
+        assert get_databricks_creds() == ("host", "/sql/path", "token")
+        assert mock_secrets.get.call_count == 3
+
+
+def test_env_token_takes_precedence(monkeypatch):
+    """DATABRICKS_TOKEN from the environment wins over dlt secrets."""
+    monkeypatch.setenv("DATABRICKS_TOKEN", "env-token")
+    with patch("dlt.secrets") as mock_secrets:
+        mock_secrets.get.side_effect = ["host", "/sql/path"]
+        assert get_databricks_creds() == ("host", "/sql/path", "env-token")
@@ -2,6 +2,7 @@ import os
 import logging
 import pytest
 from unittest.mock import patch
+from postgres_cdc.utils import logger as logger_module
 from postgres_cdc.utils.logger import setup_logger, get_logger
 from rich.logging import RichHandler
 
@@ -31,9 +32,19 @@ def test_setup_logger_defaults():
     assert logger.level == logging.INFO
     assert len(logger.handlers) == 1
     assert isinstance(logger.handlers[0], RichHandler)
+    assert logger.handlers[0] is logger_module._HANDLER # Shared across all loggers
     assert not logger.propagate # Should not propagate to root
 
 
+def test_loggers_share_single_handler():
+    """All loggers reuse the module-level handler instead of building their own."""
+    l1 = setup_logger("test_shared_handler_a")
+    l2 = setup_logger("test_shared_handler_b")
+
+    assert l1.handlers[0] is l2.handlers[0]
+    assert not l1.handlers[0].tracebacks_show_locals # Opt-in via LOG_TRACEBACK_LOCALS=1
+
+
 def test_setup_logger_custom_level():
     """Test setup_logger with explicit level argument."""
     logger_name = "test_logger_debug"
@@ -0,0 +1,27 @@
+import pytest
+
+from postgres_cdc.cli import parse_args
+
+
+def test_parse_args_defaults():
+    """No arguments: mode unset (resolved later via PIPELINE_MODE), no dry run."""
+    args = parse_args([])
+    assert args.mode is None
+    assert args.catalog is None
+    assert args.dataset is None
+    assert args.dry_run is False
+
+
+def test_parse_args_full_invocation():
+    args = parse_args([
+        "--mode", "cdc_once", "--catalog", "chinook", "--dataset", "bronze", "--dry-run"
+    ])
+    assert args.mode == "cdc_once"
+    assert args.catalog == "chinook"
+    assert args.dataset == "bronze"
+    assert args.dry_run is True
+
+
+def test_parse_args_rejects_unknown_mode():
+    with pytest.raises(SystemExit):
+        parse_args(["--mode", "bogus"])
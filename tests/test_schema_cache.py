@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from postgres_cdc.utils import schema_cache
+from postgres_cdc.utils.schema_cache import get_columns
+
+COLUMNS = [{"col_name": "invoice_id", "data_type": "bigint", "comment": None}]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the on-disk cache at a throwaway directory."""
+    monkeypatch.setattr(schema_cache, "CACHE_DIR", str(tmp_path / "describe"))
+
+
+@pytest.fixture
+def cursor():
+    cursor = MagicMock()
+    cursor.fetchone.return_value = MagicMock(version=7)
+    return cursor
+
+
+def test_same_version_hits_cache(cursor):
+    """A second lookup at the same Delta version must skip DESCRIBE."""
+    with patch.object(
+        schema_cache, "_describe", return_value=COLUMNS
+    ) as mock_describe:
+        assert get_columns(cursor, "cat.bronze.invoice") == COLUMNS
+        assert get_columns(cursor, "cat.bronze.invoice") == COLUMNS
+        assert mock_describe.call_count == 1
+
+
+def test_version_bump_invalidates_cache(cursor):
+    """A new table version must force a fresh DESCRIBE."""
+    with patch.object(
+        schema_cache, "_describe", return_value=COLUMNS
+    ) as mock_describe:
+        get_columns(cursor, "cat.bronze.invoice")
+        cursor.fetchone.return_value = MagicMock(version=8)
+        get_columns(cursor, "cat.bronze.invoice")
+        assert mock_describe.call_count == 2
+
+
+def test_history_failure_bypasses_cache(cursor):
+    """Non-Delta tables (no history) fall back to an uncached DESCRIBE."""
+    cursor.execute.side_effect = [Exception("not a Delta table"), None]
+    with patch.object(
+        schema_cache, "_describe", return_value=COLUMNS
+    ) as mock_describe:
+        assert get_columns(cursor, "cat.bronze.invoice") == COLUMNS
+        assert mock_describe.call_count == 1
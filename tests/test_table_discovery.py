@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from postgres_cdc.utils import table_discovery
+from postgres_cdc.utils.table_discovery import get_public_tables
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    """Ensure each test starts with an empty discovery cache."""
+    table_discovery.clear_cache()
+    yield
+    table_discovery.clear_cache()
+
+
+@pytest.fixture
+def creds():
+    creds = MagicMock()
+    creds.to_native_representation.return_value = "postgresql://u:p@host/db"
+    return creds
+
+
+def test_cache_hit_skips_second_query(creds):
+    """A second call within the TTL must not reconnect to PostgreSQL."""
+    with patch.object(
+        table_discovery, "_query_public_tables", return_value=["invoice"]
+    ) as mock_query:
+        assert get_public_tables(creds) == ["invoice"]
+        assert get_public_tables(creds) == ["invoice"]
+        assert mock_query.call_count == 1
+
+
+def test_zero_ttl_forces_refresh(creds):
+    """ttl=0 bypasses the cache so callers can force a fresh discovery."""
+    with patch.object(
+        table_discovery, "_query_public_tables", return_value=["invoice"]
+    ) as mock_query:
+        get_public_tables(creds, ttl=0)
+        get_public_tables(creds, ttl=0)
+        assert mock_query.call_count == 2
+
+
+def test_different_credentials_use_separate_entries(creds):
+    """Cache entries are keyed by connection string."""
+    other = MagicMock()
+    other.to_native_representation.return_value = "postgresql://u:p@other/db"
+    with patch.object(
+        table_discovery, "_query_public_tables", side_effect=[["a"], ["b"]]
+    ):
+        assert get_public_tables(creds) == ["a"]
+        assert get_public_tables(other) == ["b"]
+
+
+def test_disk_cache_survives_in_memory_clear(creds, tmp_path, monkeypatch):
+    """A fresh process (empty in-memory cache) reuses the on-disk entry."""
+    monkeypatch.setattr(table_discovery, "_DISK_CACHE_DIR", str(tmp_path))
+    with patch.object(
+        table_discovery, "_query_public_tables", return_value=["invoice"]
+    ) as mock_query:
+        get_public_tables(creds)
+        table_discovery._CACHE.clear()  # simulate a new process
+        assert get_public_tables(creds) == ["invoice"]
+        assert mock_query.call_count == 1
+
+
+def test_dlt_internal_tables_filtered_in_sql():
+    """The discovery query excludes '_dlt' tables server-side."""
+    creds = MagicMock()
+    creds.to_native_representation.return_value = "postgresql://u:p@host/db"
+
+    def fake_copy_expert(sql, buf):
+        buf.write(b"invoice\ncustomer\n")
+
+    mock_cursor = MagicMock()
+    mock_cursor.copy_expert.side_effect = fake_copy_expert
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_ctx = MagicMock()
+    mock_ctx.__enter__.return_value = mock_conn
+    with patch.object(table_discovery, "pooled_connection", return_value=mock_ctx):
+        assert get_public_tables(creds) == ["invoice", "customer"]
+    executed_sql = mock_cursor.copy_expert.call_args[0][0]
+    assert "NOT LIKE '\\_dlt%'" in executed_sql